@@ -13,6 +13,32 @@ import sys
 from pathlib import Path
 from collections import Counter
 
+# Compiled once at import time; these run for every row of the export
+_LOCAL_RE = re.compile(r'[a-zA-Z0-9._%+-]+')
+_DOMAIN_RE = re.compile(r'[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+# Drops the straight and smart quotes MailChimp wraps around tag names and
+# turns the semicolon and pipe delimiters into commas, in one pass
+_TAG_TABLE = str.maketrans({
+    '"': None, "'": None,
+    '\u201c': None, '\u201d': None, '\u2018': None, '\u2019': None,
+    ';': ',', '|': ','
+})
+# Anything clean_tags would have to rewrite: quotes, non-comma delimiters,
+# whitespace other than single spaces, and commas not written as ', '
+_TAG_DIRTY_RE = re.compile(
+    '["\'\u201c\u201d\u2018\u2019;|]|[^\\S ]|  | ,|,(?! )|^,'
+)
+# Email hashes are only safe as dedup keys when they are 64-bit; on narrower
+# builds a collision would silently drop a subscriber, so key on the string
+_EMAIL_KEY = hash if sys.hash_info.width >= 64 else str
+# Large exports are read and written sequentially, so use a 1 MiB buffer
+_IO_BUFFER_SIZE = 1 << 20
+# Cleaned rows are handed to csv.writer.writerows() in batches of this size
+_WRITE_BATCH_SIZE = 10000
+
+# ConvertKit expected columns
+CONVERTKIT_COLUMNS = ['Email', 'First Name', 'Last Name', 'Tags']
+
 
 class MailChimpToConvertKit:
     """Converter class for processing MailChimp exports to ConvertKit format."""
@@ -55,20 +81,37 @@ class MailChimpToConvertKit:
         Returns:
             Cleaned tag string suitable for ConvertKit
         """
+        cleaned = self._normalize_tags(tag_string)
+        if cleaned:
+            self.stats['tags_cleaned'] += 1
+        return cleaned
+    
+    @staticmethod
+    def _normalize_tags(tag_string):
+        """Normalize a raw tag string without touching the statistics.
+        
+        Args:
+            tag_string: Raw tag string from MailChimp export
+            
+        Returns:
+            Cleaned tag string, empty if the cell held no tags
+        """
         if not tag_string:
             return ''
         
         # Remove leading/trailing whitespace
         tag_string = tag_string.strip()
         
-        # Remove various quote styles that MailChimp might use
-        # This handles single quotes, double quotes, and smart quotes
-        quotes_to_remove = ['"', "'", '"', '"', ''', ''']
-        for quote in quotes_to_remove:
-            tag_string = tag_string.replace(quote, '')
+        # Most exports already use ConvertKit's 'tag, tag' format
+        if tag_string and not _TAG_DIRTY_RE.search(tag_string):
+            return tag_string
+        
+        # Remove various quote styles that MailChimp might use (single,
+        # double, and smart quotes) and unify semicolon and pipe delimiters
+        tag_string = tag_string.translate(_TAG_TABLE)
         
-        # Split by various delimiters (comma, semicolon, pipe)
-        tags = re.split('[,;|]', tag_string)
+        # Split by the now uniform comma delimiter
+        tags = tag_string.split(',')
         
         # Clean each tag individually
         cleaned_tags = []
@@ -79,9 +122,6 @@ class MailChimpToConvertKit:
             if cleaned_tag:
                 cleaned_tags.append(cleaned_tag)
         
-        if cleaned_tags:
-            self.stats['tags_cleaned'] += 1
-            
         # Join with ConvertKit's expected format (comma + space)
         return ', '.join(cleaned_tags)
     
@@ -97,6 +137,11 @@ class MailChimpToConvertKit:
         if not name:
             return ''
         
+        # Every whitespace character other than a plain space is unprintable,
+        # so a printable name without double spaces only needs its ends trimmed
+        if name.isprintable() and '  ' not in name:
+            return name.strip()
+        
         # Remove excessive whitespace but keep the name as-is otherwise
         return ' '.join(name.split())
     
@@ -111,63 +156,156 @@ class MailChimpToConvertKit:
         """
         if not email:
             return False
-            
-        # Basic email regex pattern
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email.strip()))
+        
+        email = email.strip()
+        
+        # Cheap structural checks first so obvious junk never reaches the
+        # regex engine: something before the '@', and a dot in the domain
+        # followed by at least a two-letter TLD
+        at = email.find('@')
+        if at < 1:
+            return False
+        dot = email.rfind('.')
+        if dot < at + 2 or dot > len(email) - 3:
+            return False
+        
+        return bool(_LOCAL_RE.fullmatch(email, 0, at) and
+                    _DOMAIN_RE.fullmatch(email, at + 1))
     
     def analyze_input(self):
         """Analyze the input file and return statistics."""
-        print("\n" + "="*60)
-        print("ANALYZING MAILCHIMP EXPORT")
-        print("="*60)
+        headers, summary = self._process_file(analyze_only=True)
+        self._print_analysis(headers, summary)
+        return self.stats
+    
+    def convert(self, remove_duplicates=True):
+        """Convert the MailChimp export to ConvertKit format.
         
-        emails_seen = []
-        tags_counter = Counter()
+        Args:
+            remove_duplicates: If True, skip duplicate email addresses
+            
+        Returns:
+            Path to the output file
+        """
+        self._process_file(remove_duplicates=remove_duplicates)
+        self._print_conversion()
+        return self.output_file
+    
+    def run(self, remove_duplicates=True, analyze_only=False):
+        """Analyze and convert the MailChimp export in a single pass.
         
-        with open(self.input_file, 'r', encoding='utf-8', errors='ignore') as file:
-            reader = csv.DictReader(file)
-            headers = reader.fieldnames
+        Args:
+            remove_duplicates: If True, skip duplicate email addresses
+            analyze_only: If True, only collect statistics without writing output
             
-            print(f"\n📊 Found {len(headers)} columns:")
-            if self.verbose:
-                for i, header in enumerate(headers, 1):
-                    print(f"   {i:2}. {header}")
+        Returns:
+            Path to the output file, or None in analyze-only mode
+        """
+        headers, summary = self._process_file(remove_duplicates, analyze_only)
+        self._print_analysis(headers, summary)
+        
+        if analyze_only:
+            return None
+        
+        self._print_conversion()
+        return self.output_file
+    
+    def _process_file(self, remove_duplicates=True, analyze_only=False):
+        """Read the export once, filling self.stats and writing the output.
+        
+        Statistics are reset first, so every call reports on exactly one pass.
+        
+        Args:
+            remove_duplicates: If True, skip duplicate email addresses
+            analyze_only: If True, only collect statistics without writing output
+            
+        Returns:
+            Tuple of (header row, summary from _process_rows)
+        """
+        for key in self.stats:
+            self.stats[key] = 0
+        
+        # utf-8-sig drops the BOM spreadsheet tools often write, which would
+        # otherwise become part of the first header name
+        with open(self.input_file, 'r', encoding='utf-8-sig', errors='ignore',
+                  buffering=_IO_BUFFER_SIZE) as infile:
+            reader = csv.reader(infile)
+            headers = next(reader, [])
+            column_mapping = self._map_columns(headers)
+            
+            # Resolve each source column to its position once, -1 if missing.
+            # Like csv.DictReader, the last of any repeated header name wins
+            positions = {name: i for i, name in enumerate(headers)}
+            column_indices = {
+                field: positions.get(column, -1)
+                for field, column in column_mapping.items()
+            }
+            
+            if analyze_only:
+                summary = self._process_rows(reader, column_indices, None, remove_duplicates)
             else:
-                # Show first 5 columns
-                for i, header in enumerate(headers[:5], 1):
-                    print(f"   {i:2}. {header}")
-                if len(headers) > 5:
-                    print(f"   ... and {len(headers) - 5} more columns")
+                with open(self.output_file, 'w', newline='', encoding='utf-8',
+                          buffering=_IO_BUFFER_SIZE) as outfile:
+                    writer = csv.writer(outfile)
+                    writer.writerow(CONVERTKIT_COLUMNS)
+                    summary = self._process_rows(reader, column_indices, writer, remove_duplicates)
+        
+        return headers, summary
+    
+    @staticmethod
+    def _map_columns(headers):
+        """Map ConvertKit columns to the MailChimp columns they are read from.
+        
+        Args:
+            headers: Column names from the MailChimp export
             
-            # Analyze data
-            for row in reader:
-                self.stats['total_rows'] += 1
-                email = row.get('Email Address', '').strip().lower()
-                
-                if email and self.validate_email(email):
-                    emails_seen.append(email)
-                    
-                    # Count tags
-                    tags = row.get('TAGS', '').strip()
-                    if tags:
-                        cleaned = self.clean_tags(tags)
-                        for tag in cleaned.split(', '):
-                            if tag:
-                                tags_counter[tag] += 1
-                elif email:
-                    self.stats['invalid_emails'] += 1
-        
-        # Check for duplicates
-        email_counts = Counter(emails_seen)
-        duplicates = {email: count for email, count in email_counts.items() if count > 1}
-        self.stats['duplicates'] = len(duplicates)
+        Returns:
+            Dict of ConvertKit column name -> MailChimp column name
+        """
+        column_mapping = {
+            'Email': 'Email Address',
+            'First Name': 'First Name',
+            'Last Name': 'Last Name',
+            'Tags': 'TAGS'
+        }
+        
+        # Check for alternative column names
+        if 'Email' in headers:
+            column_mapping['Email'] = 'Email'
+        if 'Tags' in headers:
+            column_mapping['Tags'] = 'Tags'
+        
+        return column_mapping
+    
+    def _print_analysis(self, headers, summary):
+        """Print the analysis of the export read by _process_file."""
+        print("\n" + "="*60)
+        print("ANALYZING MAILCHIMP EXPORT")
+        print("="*60)
         
+        self._print_columns(headers)
+        self._print_statistics(*summary)
+    
+    def _print_columns(self, headers):
+        """Print the columns found in the MailChimp export."""
+        print(f"\n📊 Found {len(headers)} columns:")
+        if self.verbose:
+            for i, header in enumerate(headers, 1):
+                print(f"   {i:2}. {header}")
+        else:
+            # Show first 5 columns
+            for i, header in enumerate(headers[:5], 1):
+                print(f"   {i:2}. {header}")
+            if len(headers) > 5:
+                print(f"   ... and {len(headers) - 5} more columns")
+    
+    def _print_statistics(self, valid_count, unique_count, tags_counter):
+        """Print email and tag statistics gathered from the export."""
         print(f"\n📈 Statistics:")
         print(f"   Total rows: {self.stats['total_rows']}")
-        print(f"   Valid emails: {len(emails_seen)}")
+        print(f"   Valid emails: {valid_count}")
         print(f"   Invalid emails: {self.stats['invalid_emails']}")
-        print(f"   Unique emails: {len(email_counts)}")
+        print(f"   Unique emails: {unique_count}")
         print(f"   Duplicate emails: {self.stats['duplicates']}")
         
         if tags_counter:
@@ -176,84 +314,132 @@ class MailChimpToConvertKit:
                 print(f"   - '{tag}': {count} contacts")
             if len(tags_counter) > 5:
                 print(f"   ... and {len(tags_counter) - 5} more tags")
+    
+    def _print_conversion(self):
+        """Print the results of writing the ConvertKit file."""
+        print("\n" + "="*60)
+        print("CONVERTING TO CONVERTKIT FORMAT")
+        print("="*60)
         
-        return self.stats
+        print(f"\n✅ Conversion Complete!")
+        print(f"   Output file: {self.output_file}")
+        print(f"   Contacts processed: {self.stats['processed']}")
+        print(f"   Contacts skipped: {self.stats['skipped']}")
+        print(f"   Tags cleaned: {self.stats['tags_cleaned']}")
     
-    def convert(self, remove_duplicates=True):
-        """Convert the MailChimp export to ConvertKit format.
+    def _process_rows(self, reader, column_indices, writer, remove_duplicates):
+        """Collect statistics for each row and write the cleaned rows.
         
         Args:
+            reader: csv.reader positioned after the MailChimp header row
+            column_indices: ConvertKit column name -> MailChimp column index (-1 if missing)
+            writer: csv.writer for the output, or None to only analyze
             remove_duplicates: If True, skip duplicate email addresses
             
         Returns:
-            Path to the output file
+            Tuple of (valid email count, unique email count, tag Counter)
         """
-        print("\n" + "="*60)
-        print("CONVERTING TO CONVERTKIT FORMAT")
-        print("="*60)
+        # On 64-bit builds duplicates are tracked by the hash of the lowercased
+        # email rather than the string itself, which keeps memory flat on very
+        # large exports; collisions within one run are negligible at that width
+        seen = set()
+        dupes = set()
+        valid_count = 0
+        tags_counter = Counter()
         
-        emails_processed = set()
+        # Row counters are kept in locals and added to self.stats after the loop
+        total_rows = processed = skipped = invalid_emails = tags_cleaned = 0
         
-        with open(self.input_file, 'r', encoding='utf-8', errors='ignore') as infile:
-            reader = csv.DictReader(infile)
+        email_idx = column_indices['Email']
+        first_idx = column_indices['First Name']
+        last_idx = column_indices['Last Name']
+        tags_idx = column_indices['Tags']
+        width = max(column_indices.values()) + 1
+        
+        # Bind per-row callables to locals to avoid attribute lookups in the loop
+        validate_email = self.validate_email
+        clean_name = self.clean_name
+        normalize_tags = self._normalize_tags
+        count_tags = tags_counter.update
+        email_key_of = _EMAIL_KEY
+        add_seen = seen.add
+        batch = []
+        add_to_batch = batch.append
+        
+        for row in reader:
+            # Skip blank lines, as csv.DictReader does
+            if not row:
+                continue
+            # Pad short rows so every mapped index is addressable
+            if len(row) < width:
+                row += [''] * (width - len(row))
             
-            # Check which columns are available
-            available_columns = reader.fieldnames
+            total_rows += 1
+            email = row[email_idx].strip() if email_idx >= 0 else ''
             
-            # Map MailChimp columns to ConvertKit columns
-            column_mapping = {
-                'Email': 'Email Address',
-                'First Name': 'First Name',
-                'Last Name': 'Last Name',
-                'Tags': 'TAGS'
-            }
+            # Skip invalid emails
+            if not email or not validate_email(email):
+                if email:
+                    invalid_emails += 1
+                skipped += 1
+                continue
+            
+            valid_count += 1
+            
+            # Track duplicates
+            # Most addresses are already lowercase; skip the copy for those
+            email_key = email_key_of(email if email.islower() else email.lower())
+            duplicate = email_key in seen
+            if duplicate:
+                dupes.add(email_key)
+            else:
+                add_seen(email_key)
             
-            # Check for alternative column names
-            if 'Email' in available_columns:
-                column_mapping['Email'] = 'Email'
-            if 'Tags' in available_columns:
-                column_mapping['Tags'] = 'Tags'
+            # Clean tags once; the same string feeds the counter and the output.
+            # Cleaning never emits empty tags, so a non-empty result splits
+            # cleanly on the ConvertKit separator
+            tags = normalize_tags(row[tags_idx]) if tags_idx >= 0 else ''
+            if tags:
+                count_tags(tags.split(', '))
             
-            with open(self.output_file, 'w', newline='', encoding='utf-8') as outfile:
-                # ConvertKit expected columns
-                fieldnames = ['Email', 'First Name', 'Last Name', 'Tags']
-                writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for row in reader:
-                    email = row.get(column_mapping['Email'], '').strip()
-                    
-                    # Skip invalid emails
-                    if not email or not self.validate_email(email):
-                        self.stats['skipped'] += 1
-                        continue
-                    
-                    # Handle duplicates
-                    email_lower = email.lower()
-                    if remove_duplicates and email_lower in emails_processed:
-                        self.stats['skipped'] += 1
-                        continue
-                    
-                    emails_processed.add(email_lower)
-                    
-                    # Create cleaned row
-                    clean_row = {
-                        'Email': email,
-                        'First Name': self.clean_name(row.get(column_mapping['First Name'], '')),
-                        'Last Name': self.clean_name(row.get(column_mapping['Last Name'], '')),
-                        'Tags': self.clean_tags(row.get(column_mapping['Tags'], ''))
-                    }
-                    
-                    writer.writerow(clean_row)
-                    self.stats['processed'] += 1
+            if writer is None:
+                # Analysis counts every valid row's tags, as it always has
+                if tags:
+                    tags_cleaned += 1
+                continue
+            
+            if remove_duplicates and duplicate:
+                skipped += 1
+                continue
+            
+            # Only count tag cells of rows that are actually written
+            if tags:
+                tags_cleaned += 1
+            
+            add_to_batch([
+                email,
+                clean_name(row[first_idx]) if first_idx >= 0 else '',
+                clean_name(row[last_idx]) if last_idx >= 0 else '',
+                tags
+            ])
+            processed += 1
+            if len(batch) >= _WRITE_BATCH_SIZE:
+                writer.writerows(batch)
+                batch.clear()
         
-        print(f"\n✅ Conversion Complete!")
-        print(f"   Output file: {self.output_file}")
-        print(f"   Contacts processed: {self.stats['processed']}")
-        print(f"   Contacts skipped: {self.stats['skipped']}")
-        print(f"   Tags cleaned: {self.stats['tags_cleaned']}")
+        if batch:
+            writer.writerows(batch)
         
-        return self.output_file
+        self.stats['total_rows'] = total_rows
+        self.stats['invalid_emails'] = invalid_emails
+        self.stats['tags_cleaned'] = tags_cleaned
+        self.stats['duplicates'] = len(dupes)
+        # Nothing is processed or skipped when only analyzing
+        if writer is not None:
+            self.stats['processed'] = processed
+            self.stats['skipped'] = skipped
+        
+        return valid_count, len(seen), tags_counter
 
 
 def main():
@@ -293,15 +479,13 @@ Examples:
             args.verbose
         )
         
-        # Always analyze first
-        converter.analyze_input()
+        # Analyze, and convert in the same pass unless analyze-only mode
+        output_file = converter.run(
+            remove_duplicates=not args.keep_duplicates,
+            analyze_only=args.analyze_only
+        )
         
-        # Convert unless analyze-only mode
-        if not args.analyze_only:
-            output_file = converter.convert(
-                remove_duplicates=not args.keep_duplicates
-            )
-            
+        if output_file:
             print("\n📝 Import Instructions for ConvertKit:")
             print("   1. Log into ConvertKit")
             print("   2. Go to Subscribers → Import Subscribers")
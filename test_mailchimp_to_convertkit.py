@@ -0,0 +1,214 @@
+"""Tests for mailchimp_to_convertkit.
+
+The fast paths in validate_email, clean_tags and clean_name are checked
+against straightforward reference implementations of the original logic.
+"""
+
+import csv
+import random
+import re
+
+import pytest
+
+from mailchimp_to_convertkit import MailChimpToConvertKit
+
+
+HEADER = 'First Name,Last Name,Email Address,TAGS\n'
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+QUOTES = '"\'“”‘’'
+
+
+def reference_validate_email(email):
+    """Single-regex email validation the split checks must agree with."""
+    if not email:
+        return False
+    return bool(EMAIL_PATTERN.match(email.strip()))
+
+
+def reference_clean_tags(tag_string):
+    """Full tag cleanup without any fast path."""
+    if not tag_string:
+        return ''
+    for quote in QUOTES:
+        tag_string = tag_string.replace(quote, '')
+    tags = (' '.join(tag.split()) for tag in re.split('[,;|]', tag_string))
+    return ', '.join(tag for tag in tags if tag)
+
+
+def reference_clean_name(name):
+    """Whitespace normalization without any fast path."""
+    if not name:
+        return ''
+    return ' '.join(name.split())
+
+
+def random_strings(alphabet, count, max_length, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+
+
+def write_csv(path, text, encoding='utf-8'):
+    path.write_text(text, encoding=encoding)
+    return path
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.reader(file))
+
+
+@pytest.fixture
+def converter(tmp_path):
+    return MailChimpToConvertKit(write_csv(tmp_path / 'export.csv', HEADER))
+
+
+def test_validate_email_matches_single_regex(converter):
+    for email in random_strings('ab1.@-_%+ Z\n', 50000, 10, seed=1):
+        assert converter.validate_email(email) == reference_validate_email(email), repr(email)
+
+
+@pytest.mark.parametrize('email', [
+    'john.doe@example.com', ' padded@example.org ', 'a@b.co', 'x+tag@sub.example.io',
+    'invalid.email.com', '@example.com', 'a@.com', 'a@b.c', 'a@b.', 'a@@b.com',
+    'a@b..com', 'a@b.c0m', '', None,
+])
+def test_validate_email_cases(converter, email):
+    assert converter.validate_email(email) == reference_validate_email(email)
+
+
+def test_clean_tags_matches_full_cleanup(converter):
+    alphabet = 'ab ,;|\t\n\r\xa0' + QUOTES
+    for tag_string in random_strings(alphabet, 50000, 10, seed=2):
+        assert converter.clean_tags(tag_string) == reference_clean_tags(tag_string), repr(tag_string)
+
+
+@pytest.mark.parametrize('tag_string', [
+    'Newsletter, VIP', 'Newsletter', 'a,b', ', a', 'a ,b', 'a, , b', 'a,',
+    'a  b', 'a\tb', 'a\xa0b', '"VIP"', '“VIP”; News', 'a|b', '   ',
+])
+def test_clean_tags_cases(converter, tag_string):
+    assert converter.clean_tags(tag_string) == reference_clean_tags(tag_string)
+
+
+def test_clean_tags_counts_non_empty_results(converter):
+    for tag_string in ['a', 'b, c', '', '   ', '""']:
+        converter.clean_tags(tag_string)
+    assert converter.stats['tags_cleaned'] == 2
+
+
+def test_only_plain_space_is_printable_whitespace():
+    # clean_name's fast path relies on this
+    whitespace = [chr(i) for i in range(0x110000) if chr(i).isspace()]
+    assert [ch for ch in whitespace if ch.isprintable()] == [' ']
+
+
+def test_clean_name_matches_full_cleanup(converter):
+    whitespace = [chr(i) for i in range(0x110000) if chr(i).isspace()]
+    alphabet = whitespace + list("ab'&é ") * 8
+    for name in random_strings(alphabet, 50000, 7, seed=3):
+        assert converter.clean_name(name) == reference_clean_name(name), repr(name)
+
+
+def test_run_writes_cleaned_rows(tmp_path):
+    export = write_csv(tmp_path / 'export.csv', HEADER + (
+        'John,Doe,john@example.com,"""Newsletter"";""VIP"""\n'
+        'Mary  Jane,Watson,mj@example.com,\n'
+        'Bad,Email,invalid.email.com,Newsletter\n'
+        '\n'
+        'Jo,Dup,JOHN@example.com,Newsletter\n'
+    ))
+    output = tmp_path / 'out.csv'
+    converter = MailChimpToConvertKit(export, output)
+
+    assert converter.run() == output
+    assert read_rows(output) == [
+        ['Email', 'First Name', 'Last Name', 'Tags'],
+        ['john@example.com', 'John', 'Doe', 'Newsletter, VIP'],
+        ['mj@example.com', 'Mary Jane', 'Watson', ''],
+    ]
+    assert converter.stats == {
+        'total_rows': 4,
+        'processed': 2,
+        'skipped': 2,
+        'duplicates': 1,
+        'invalid_emails': 1,
+        'tags_cleaned': 1,
+    }
+
+
+def test_keep_duplicates_writes_every_valid_row(tmp_path):
+    export = write_csv(tmp_path / 'export.csv', HEADER + (
+        'A,A,a@x.com,t1\n'
+        'A,A,a@x.com,t1\n'
+        'A,A,A@x.com,t2\n'
+    ))
+    converter = MailChimpToConvertKit(export, tmp_path / 'out.csv')
+    converter.run(remove_duplicates=False)
+    assert converter.stats['processed'] == 3
+    assert converter.stats['tags_cleaned'] == 3
+    assert converter.stats['duplicates'] == 1
+
+
+def test_analyze_then_convert_counts_each_pass_once(tmp_path):
+    export = write_csv(tmp_path / 'export.csv', HEADER + (
+        'A,A,a@x.com,t1\n'
+        'B,B,bad,t1\n'
+        'C,C,,\n'
+        'A,A,a@x.com,t2\n'
+    ))
+    converter = MailChimpToConvertKit(export, tmp_path / 'out.csv')
+
+    stats = dict(converter.analyze_input())
+    assert stats == {
+        'total_rows': 4,
+        'processed': 0,
+        'skipped': 0,
+        'duplicates': 1,
+        'invalid_emails': 1,
+        'tags_cleaned': 2,
+    }
+
+    converter.convert()
+    assert converter.stats == {
+        'total_rows': 4,
+        'processed': 1,
+        'skipped': 3,
+        'duplicates': 1,
+        'invalid_emails': 1,
+        'tags_cleaned': 1,
+    }
+
+
+def test_analyze_only_writes_nothing(tmp_path):
+    export = write_csv(tmp_path / 'export.csv', HEADER + 'A,A,a@x.com,t1\n')
+    output = tmp_path / 'out.csv'
+    assert MailChimpToConvertKit(export, output).run(analyze_only=True) is None
+    assert not output.exists()
+
+
+def test_repeated_header_uses_last_column(tmp_path):
+    export = write_csv(tmp_path / 'export.csv', (
+        'Email Address,Email Address,TAGS\n'
+        'first@x.com,second@x.com,t\n'
+    ))
+    output = tmp_path / 'out.csv'
+    MailChimpToConvertKit(export, output).run()
+    assert read_rows(output)[1] == ['second@x.com', '', '', 't']
+
+
+def test_byte_order_mark_is_ignored(tmp_path):
+    export = write_csv(tmp_path / 'export.csv', 'Email Address,TAGS\na@x.com,t\n',
+                       encoding='utf-8-sig')
+    output = tmp_path / 'out.csv'
+    MailChimpToConvertKit(export, output).run()
+    assert read_rows(output)[1] == ['a@x.com', '', '', 't']
+
+
+@pytest.mark.parametrize('text', ['', 'Email Address,TAGS\n', 'foo,bar\n1,2\n'])
+def test_exports_without_usable_rows(tmp_path, text):
+    export = write_csv(tmp_path / 'export.csv', text)
+    output = tmp_path / 'out.csv'
+    MailChimpToConvertKit(export, output).run()
+    assert read_rows(output) == [['Email', 'First Name', 'Last Name', 'Tags']]